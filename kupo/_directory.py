@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import os
 import re
+import shutil
+from itertools import compress, product, repeat
 from pathlib import Path
 from subprocess import call
 
 from rich.align import Align
-from rich.console import RenderableType, RenderResult, Console, ConsoleOptions
-from rich.markup import escape
+from rich.console import RenderableType, RenderResult, Console, ConsoleOptions, NewLine
 from rich.style import Style
 from rich.table import Table
 from rich.text import Text
@@ -16,11 +17,33 @@ from textual.binding import Binding
 from textual.dom import DOMNode
 from textual.geometry import clamp, Size, Region
 from textual.message import Message
-from textual.reactive import reactive
+from textual.reactive import reactive, watch
 from textual.widget import Widget
 
 from kupo._directory_search import DirectorySearch
-from kupo._files import convert_size, list_files_in_dir, _count_files, rm_tree
+from kupo._files import Entry, convert_size, list_files_in_dir, _cached_count
+
+# Rows rendered above and below the visible region of a Directory
+_OVERSCAN = 8
+
+_DEFAULT_HIGHLIGHT = Style.parse("bold red on #1E90FF")
+_DIM = Style(dim=True)
+
+# DirectoryListRenderable style arguments, and the component classes they come from
+_COMPONENT_STYLE_ARGUMENTS = {
+    "dir_style": "directory--dir",
+    "highlight_style": "directory--highlighted",
+    "highlight_dir_style": "directory--highlighted-dir",
+    "meta_column_style": "directory--meta-column",
+    "highlight_meta_column_style": "directory--highlighted-meta-column",
+    "chosen_path_style": "directory--chosen-path",
+    "chosen_path_meta_style": "directory--chosen-path-meta",
+    "chosen_path_selected_style": "directory--chosen-path-selected",
+    "chosen_path_selected_meta_style": "directory--chosen-path-selected-meta",
+}
+
+# Filters containing none of these can be matched without the regex engine
+_REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
 
 
 class EmptyDirectoryRenderable:
@@ -33,9 +56,9 @@ class EmptyDirectoryRenderable:
 class DirectoryListRenderable:
     def __init__(
         self,
-        files: list[Path],
+        files: list[Entry],
         selected_index: int | None,
-        filter: str = "",
+        filter: str | re.Pattern[str] = "",
         dir_style: Style | None = None,
         highlight_style: Style | None = None,
         highlight_dir_style: Style | None = None,
@@ -45,11 +68,26 @@ class DirectoryListRenderable:
         chosen_path_meta_style: Style | None = None,
         chosen_path_selected_style: Style | None = None,
         chosen_path_selected_meta_style: Style | None = None,
-        chosen_paths: set[Path] | None = None,
+        chosen_paths: set[str] | None = None,
+        start: int = 0,
+        end: int | None = None,
+        row_cache: dict[tuple[str, bool, bool], tuple[Text, Text]] | None = None,
     ) -> None:
+        """
+        Args:
+            filter: Pattern to highlight in file names. It doesn't hide any files,
+                so callers should pass the already filtered list.
+            start: Index of the first file to render. Earlier files are rendered
+                as blank lines so later rows keep their position.
+            end: Index to stop rendering files at, or None to render to the end.
+            row_cache: Rendered rows keyed on (path, is_selected, is_chosen), which
+                are reused across renders. The owner must clear it when the files,
+                filter or styles change.
+        """
         self.files = files
         self.selected_index = selected_index
         self.filter = filter
+        self._filter_re = re.compile(filter) if filter else None
         self.dir_style = dir_style
         self.highlight_style = highlight_style
         self.highlight_dir_style = highlight_dir_style
@@ -60,6 +98,42 @@ class DirectoryListRenderable:
         self.chosen_path_selected_style = chosen_path_selected_style
         self.chosen_path_selected_meta_style = chosen_path_selected_meta_style
         self.chosen_paths = chosen_paths
+        self.start = start
+        self.end = end
+        self.row_cache = row_cache
+        self._row_styles = self._build_row_styles()
+
+    def _build_row_styles(self) -> dict[tuple[bool, bool, bool], tuple[Style, Style]]:
+        """Combine the styles for each (is_selected, is_dir, is_chosen) row state,
+        so rows can look up their (name, meta) styles instead of adding them up."""
+        null_style = Style.null()
+        row_styles = {}
+        for is_selected, is_dir, is_chosen in product((False, True), repeat=3):
+            if is_selected:
+                meta_style = self.highlight_meta_column_style or null_style
+                if is_dir:
+                    style = self.highlight_dir_style or _DEFAULT_HIGHLIGHT
+                else:
+                    style = self.highlight_style or _DEFAULT_HIGHLIGHT
+            else:
+                meta_style = self.meta_column_style or null_style
+                if is_dir:
+                    style = self.dir_style or null_style
+                else:
+                    style = null_style
+
+            if is_chosen:
+                style += self.chosen_path_style
+                meta_style += self.chosen_path_meta_style
+                if is_selected:
+                    style += self.chosen_path_selected_style
+                    meta_style += self.chosen_path_selected_meta_style
+
+            if is_dir:
+                meta_style += _DIM
+
+            row_styles[is_selected, is_dir, is_chosen] = style, meta_style
+        return row_styles
 
     def __rich_console__(
         self, console: Console, options: ConsoleOptions
@@ -71,56 +145,54 @@ class DirectoryListRenderable:
         table.add_column()
         table.add_column(justify="right", max_width=8)
 
-        for index, file in enumerate(self.files):
-            is_dir = file.is_dir()
-            if not self.filter or (self.filter and re.search(self.filter, file.name)):
-
-                if index == self.selected_index:
-                    meta_style = self.highlight_meta_column_style
-                    if is_dir:
-                        style = self.highlight_dir_style or "bold red on #1E90FF"
-                    else:
-                        style = self.highlight_style or "bold red on #1E90FF"
-                else:
-                    meta_style = self.meta_column_style
-                    if is_dir:
-                        style = self.dir_style
-                    else:
-                        style = Style.null()
-
-                if isinstance(style, str):
-                    style = Style.parse(style)
-
-                if self.chosen_paths and file in self.chosen_paths:
-                    style += self.chosen_path_style
-                    meta_style += self.chosen_path_meta_style
-                    if index == self.selected_index:
-                        style += self.chosen_path_selected_style
-                        meta_style += self.chosen_path_selected_meta_style
-
-                file_name = escape(file.name)
-                if is_dir:
-                    file_name += "/"
-                    meta_value = str(_count_files(file) or "?")
-                    meta_style += Style(dim=True)
-                else:
-                    try:
-                        meta_value = convert_size(file.stat().st_size)
-                    except FileNotFoundError:
-                        meta_value = "[dim]?"
-
-                file_name = Text(file_name, style=style)
-                if file_name.plain.startswith(".") and index != self.selected_index:
-                    file_name.stylize(Style(dim=True))
-                if self.filter:
-                    file_name.highlight_regex(self.filter, "#191004 on #FEA62B")
-
-                table.add_row(
-                    file_name,
-                    Text.from_markup(meta_value, style=meta_style),
-                )
+        start = self.start
+        if start:
+            yield NewLine(start)
+
+        rows = enumerate(self.files[start:self.end], start=start)
+        selected_index = self.selected_index
+        chosen_paths = self.chosen_paths
+        row_cache = self.row_cache
+        for index, file in rows:
+            path = str(file.path)
+            is_selected = index == selected_index
+            is_chosen = bool(chosen_paths) and path in chosen_paths
+            if row_cache is None:
+                row = self._render_row(file, is_selected, is_chosen)
+            else:
+                cache_key = (path, is_selected, is_chosen)
+                row = row_cache.get(cache_key)
+                if row is None:
+                    row = self._render_row(file, is_selected, is_chosen)
+                    row_cache[cache_key] = row
+            table.add_row(*row)
         yield table
 
+    def _render_row(
+        self, file: Entry, is_selected: bool, is_chosen: bool
+    ) -> tuple[Text, Text]:
+        is_dir = file.is_dir
+        style, meta_style = self._row_styles[is_selected, is_dir, is_chosen]
+
+        file_name = file.escaped_name
+        if is_dir:
+            file_name += "/"
+            # A plain count, so there's no markup to parse
+            count = _cached_count(str(file.path), file.mtime_ns)
+            meta = Text(str(count or "?"), style=meta_style)
+        elif file.size is None:
+            meta = Text.from_markup("[dim]?", style=meta_style)
+        else:
+            meta = Text.from_markup(convert_size(file.size), style=meta_style)
+
+        file_name = Text(file_name, style=style)
+        if file.name.startswith(".") and not is_selected:
+            file_name.stylize(_DIM)
+        if self._filter_re:
+            file_name.highlight_regex(self._filter_re, "#191004 on #FEA62B")
+
+        return file_name, meta
+
 
 class Directory(Widget, can_focus=True):
     COMPONENT_CLASSES = {
@@ -166,10 +238,16 @@ class Directory(Widget, can_focus=True):
         """
         super().__init__(name=name, id=id, classes=classes)
         self.path = path or Path.cwd()
-        self._files = list_files_in_dir(self.path)
         self.directory_search = directory_search
         self.cursor_movement_enabled = cursor_movement_enabled
-        self.chosen_paths: set[Path] = set()
+        self.chosen_paths: set[str] = set()
+        self._filter_re: re.Pattern[str] | None = None
+        self._row_cache: dict[tuple[str, bool, bool], tuple[Text, Text]] = {}
+        self._styles: dict[str, Style] | None = None
+        self._selected_file: Entry | None = None
+        # Maps each path in _files to its index, built when first needed
+        self._file_index: dict[Path, int] | None = None
+        self._load_files()
 
     def key_up(self, event: events.Key) -> None:
         event.stop()
@@ -184,6 +262,11 @@ class Directory(Widget, can_focus=True):
     def _on_mount(self, event: events.Mount) -> None:
         # This is in place to trigger the FilePreviewChanged
         self.selected_index = 0
+        # We only render the rows in view, so we need to render again on scroll
+        watch(self.parent, "scroll_y", self._on_parent_scroll_y)
+
+    def _on_parent_scroll_y(self, scroll_y: float) -> None:
+        self.refresh()
 
     @property
     def selected_index(self):
@@ -194,9 +277,13 @@ class Directory(Widget, can_focus=True):
 
         if new_value is not None:
             self._selected_index = self._clamp_index(new_value)
-            if self._files:
-                selected_file = self._files[self._selected_index]
-                self.emit_no_wait(Directory.FilePreviewChanged(self, selected_file))
+            selected_file = self._files[self._selected_index] if self._files else None
+            # Holding a key at either end of the list keeps "selecting" the same file
+            if selected_file is not None and selected_file is not self._selected_file:
+                self.emit_no_wait(Directory.FilePreviewChanged(self, selected_file.path))
+            self._selected_file = selected_file
+        else:
+            self._selected_file = None
         # If we're scrolled such that the selected index is not on screen.
         # That is, if the selected index does not lie between scroll_y and scroll_y+content_region.height,
         # Then update the scrolling
@@ -248,7 +335,7 @@ class Directory(Widget, can_focus=True):
         elif self.current_highlighted_path.is_file():
             editor = os.environ.get('EDITOR', 'vim')
             with self.app.suspend():
-                call([editor, str(self.current_highlighted_path.resolve().absolute())])
+                call([editor, str(self.current_highlighted_path)])
 
     def action_goto_parent(self):
         self.directory_search.input.value = ""
@@ -259,25 +346,41 @@ class Directory(Widget, can_focus=True):
         )
 
     def action_toggle_selected(self):
-        if self.current_highlighted_path in self.chosen_paths:
-            self.chosen_paths.remove(self.current_highlighted_path)
+        if self.current_highlighted_path is None:
+            return
+        path = str(self.current_highlighted_path)
+        if path in self.chosen_paths:
+            self.chosen_paths.remove(path)
         else:
-            self.chosen_paths.add(self.current_highlighted_path)
+            self.chosen_paths.add(path)
         self.refresh()
         self._emit_secondary_selection_changed()
 
     def action_delete_selected(self):
         print(f"removing selected files {self.chosen_paths}")
         chosen_paths = self.chosen_paths.copy()
+        entries = {str(file.path): file for file in self._all_files}
         for path in chosen_paths:
-            if path.is_file():
-                os.remove(path)
+            entry = entries.get(path)
+            is_dir = entry.is_dir if entry else os.path.isdir(path)
+            # is_dir follows symlinks, but we only want to remove the link itself
+            if is_dir and not os.path.islink(path):
+                shutil.rmtree(path)
             else:
-                rm_tree(path)
+                os.remove(path)
             self.chosen_paths.remove(path)
 
         self._emit_secondary_selection_changed()
-        self.update_source_directory(self.path)
+        # Drop the deleted entries rather than reading the directory again
+        self._all_files = [
+            file for file in self._all_files if str(file.path) not in chosen_paths
+        ]
+        self._all_names = [file.name for file in self._all_files]
+        self._files = [
+            file for file in self._files if str(file.path) not in chosen_paths
+        ]
+        self._file_index = None
+        self.selected_index = 0 if self._files else None
         self.refresh()
 
     def _emit_secondary_selection_changed(self) -> None:
@@ -298,22 +401,48 @@ class Directory(Widget, can_focus=True):
         return clamp(new_index, 0, len(self._files) - 1)
 
     def watch_filter(self, new_filter: str):
-        self._files = [file for file in list_files_in_dir(self.path) if
-                       re.match(new_filter, file.name)]
+        filter_re = None
+        if new_filter:
+            try:
+                filter_re = re.compile(new_filter)
+            except re.error:
+                # Likely a half-typed pattern (e.g. "[") - treat it literally
+                filter_re = re.compile(re.escape(new_filter))
+        self._filter_re = filter_re
+        self._row_cache.clear()
+        files = self._all_files
+        names = self._all_names
+        if not new_filter:
+            self._files = files
+        elif _REGEX_METACHARACTERS.isdisjoint(new_filter):
+            matches = map(str.startswith, names, repeat(new_filter))
+            self._files = list(compress(files, matches))
+        else:
+            self._files = list(compress(files, map(filter_re.match, names)))
+        self._file_index = None
         self.selected_index = 0 if self._files else None
 
     @property
     def current_highlighted_path(self):
-        if not self._files:
+        if self._selected_file is None:
             return None
-        return self._files[self.selected_index]
+        return self._selected_file.path
 
     def update_source_directory(self, new_path: Path | None) -> None:
         if new_path is not None:
             self.path = new_path
-            self._files = list_files_in_dir(new_path)
+            self._load_files()
         self.selected_index = 0 if len(self._files) > 0 else None
 
+    def _load_files(self) -> None:
+        """Read the contents of self.path, discarding any active filter."""
+        self._all_files = list_files_in_dir(self.path)
+        # Kept alongside the entries so filtering only has to walk the names
+        self._all_names = [file.name for file in self._all_files]
+        self._files = self._all_files
+        self._file_index = None
+        self._row_cache.clear()
+
     def get_content_height(self, container: Size, viewport: Size, width: int) -> int:
         return max(len(self._files), container.height)
 
@@ -332,43 +461,38 @@ class Directory(Widget, can_focus=True):
             self.selected_index = 0
             return
 
-        try:
-            index = self._files.index(path)
-        except ValueError:
-            index = 0
-        self.selected_index = index
+        if self._file_index is None:
+            self._file_index = {
+                file.path: index for index, file in enumerate(self._files)
+            }
+        self.selected_index = self._file_index.get(path, 0)
 
     def render(self) -> RenderableType:
-        dir_style = self.get_component_rich_style("directory--dir")
-        highlight_style = self.get_component_rich_style("directory--highlighted")
-        highlight_meta_column_style = self.get_component_rich_style(
-            "directory--highlighted-meta-column"
-        )
-        meta_column_style = self.get_component_rich_style("directory--meta-column")
-        highlight_dir_style = self.get_component_rich_style(
-            "directory--highlighted-dir"
-        )
-        chosen_path_style = self.get_component_rich_style("directory--chosen-path")
-        chosen_path_meta_style = self.get_component_rich_style("directory--chosen-path-meta")
-
-        chosen_path_selected_style = self.get_component_rich_style("directory--chosen-path-selected")
-        chosen_path_selected_meta_style = self.get_component_rich_style("directory--chosen-path-selected-meta")
+        if self._styles is None:
+            self._styles = {
+                argument: self.get_component_rich_style(component_class)
+                for argument, component_class in _COMPONENT_STYLE_ARGUMENTS.items()
+            }
+
+        scroll_y = int(self.parent.scroll_y)
+        start = max(0, scroll_y - _OVERSCAN)
+        end = scroll_y + self.parent.size.height + _OVERSCAN
         return DirectoryListRenderable(
             files=self._files,
             selected_index=self.selected_index,
-            filter=self.filter,
-            dir_style=dir_style,
-            highlight_style=highlight_style,
-            highlight_dir_style=highlight_dir_style,
-            meta_column_style=meta_column_style,
-            highlight_meta_column_style=highlight_meta_column_style,
-            chosen_path_style=chosen_path_style,
-            chosen_path_meta_style=chosen_path_meta_style,
-            chosen_path_selected_style=chosen_path_selected_style,
-            chosen_path_selected_meta_style=chosen_path_selected_meta_style,
+            filter=self._filter_re or "",
             chosen_paths=self.chosen_paths,
+            start=start,
+            end=end,
+            row_cache=self._row_cache,
+            **self._styles,
         )
 
+    def notify_style_update(self) -> None:
+        super().notify_style_update()
+        self._styles = None
+        self._row_cache.clear()
+
     class CurrentDirChanged(Message, bubble=True):
         def __init__(
             self, sender: DOMNode, new_dir: Path, from_dir: Path | None
@@ -394,7 +518,7 @@ class Directory(Widget, can_focus=True):
     class SecondarySelectionChanged(Message, bubble=True):
         """Should be sent to the app when the secondary selection is changed."""
 
-        def __init__(self, sender: DOMNode, selection: set[Path]) -> None:
+        def __init__(self, sender: DOMNode, selection: set[str]) -> None:
             self.sender = sender
             self.selection = selection
             super().__init__(sender)
@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import math
 import os
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
+from rich.markup import escape
+
 
 def convert_size(size_bytes: int) -> str:
     if size_bytes == 0:
@@ -16,32 +20,77 @@ def convert_size(size_bytes: int) -> str:
     return f"{number:.0f}[dim]{unit}[/]"
 
 
-def list_files_in_dir(dir: Path) -> list[Path]:
+@dataclass(slots=True)
+class Entry:
+    """A single item in a directory listing, with the details we need to
+    render it captured up front so rendering doesn't hit the filesystem."""
+
+    path: Path
+    name: str
+    is_dir: bool
+    size: int | None
+    """The size in bytes, or None for directories and files we can't stat."""
+    mtime_ns: int
+    """The modification time in nanoseconds, or 0 if we can't stat."""
+    escaped_name: str = field(init=False)
+    """The name with any Rich markup escaped."""
+
+    def __post_init__(self) -> None:
+        self.escaped_name = _maybe_escape(self.name)
+
+
+def _maybe_escape(text: str) -> str:
+    """Escape Rich markup in text, skipping escape() when it can't contain any."""
+    # escape only ever changes text containing "[", and the check is a fast C scan
+    return escape(text) if "[" in text else text
+
+
+def list_files_in_dir(dir: Path) -> list[Entry]:
     try:
-        files = sorted(list(dir.iterdir()), key=_directory_sorter)
+        with os.scandir(dir) as it:
+            files = sorted((_make_entry(entry) for entry in it), key=_directory_sorter)
     except OSError:
         files = []
     return files
 
 
-def _directory_sorter(path: Path) -> tuple[bool, bool, str]:
-    name = path.name
-    return not path.is_dir(), not name.startswith("."), name
+def _make_entry(dir_entry: os.DirEntry) -> Entry:
+    is_dir = dir_entry.is_dir()
+    try:
+        stat = dir_entry.stat()
+    except OSError:
+        size = None
+        mtime_ns = 0
+    else:
+        size = None if is_dir else stat.st_size
+        mtime_ns = stat.st_mtime_ns
+    return Entry(
+        path=Path(dir_entry.path),
+        name=dir_entry.name,
+        is_dir=is_dir,
+        size=size,
+        mtime_ns=mtime_ns,
+    )
+
 
+def _directory_sorter(entry: Entry) -> tuple[bool, bool, str]:
+    name = entry.name
+    return not entry.is_dir, not name.startswith("."), name
 
-def _count_files(dir: Path) -> int | None:
+
+def _count_files(dir: str | Path) -> int | None:
     """Return the number of files in a directory.
     Return None if we can't (e.g. permission error)"""
     try:
-        return len([1 for x in os.scandir(dir)])
-    except PermissionError:
+        with os.scandir(dir) as entries:
+            return sum(1 for _ in entries)
+    except OSError:
         return None
 
 
-def rm_tree(pth: Path) -> None:
-    for child in pth.iterdir():
-        if child.is_file():
-            child.unlink()
-        else:
-            rm_tree(child)
-    pth.rmdir()
+@lru_cache(maxsize=4096)
+def _cached_count(path: str, mtime_ns: int) -> int | None:
+    """Return the number of files in a directory, reusing the previous count
+    for as long as the directory's modification time is unchanged."""
+    return _count_files(path)
+